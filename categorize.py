@@ -1,7 +1,18 @@
 # categorize.py — rules for auto-categorizing expenses
 import re
+import string
 import pandas as pd
 
+try:  # optional: SIMD multi-pattern matching
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:  # optional: single-pass multi-keyword matching
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 CATEGORY_RULES = {
     "Food":       [r"starbucks|cafe|restaurant|swiggy|zomato|pizza|maggie|coffee|burger"],
     "Transport":  [r"uber|ola|metro|bus|train|cab|taxi|auto|fuel|petrol|diesel"],
@@ -9,24 +20,146 @@ CATEGORY_RULES = {
     "Housing":    [r"rent|pg|maintenance|electricity|water bill|gas bill|wifi|broadband"],
     "Health":     [r"pharmacy|chemist|doctor|hospital|clinic|medicine|gym"],
     "Pleasure":   [r"movie|cinema|netflix|spotify|prime|gaming|ps|steam"],
-    "Other":      [r".*"]  # fallback
+    # anything unmatched falls back to "Other" (see classify_one/auto_categorize)
 }
 
+# flat (category, compiled pattern) pairs, built once at import in priority order;
+# ASCII-only case-insensitive, the same folding Hyperscan's CASELESS and the
+# automaton use, so every backend agrees (and "ſ"/"K"/"İ" never fold into keywords)
+COMPILED_RULES = tuple((cat, re.compile(pats[0], re.IGNORECASE | re.ASCII))
+                       for cat, pats in CATEGORY_RULES.items())
+
+# ASCII-only lowercasing for the automaton, which has no caseless mode
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+def _keywords_are_literal() -> bool:
+    """Aho-Corasick only handles plain keyword alternations; any regex syntax rules it out."""
+    return all(not set(word) & set(r".^$*+?{}[]\|()")
+               for _, rx in COMPILED_RULES for word in rx.pattern.split("|"))
+
+def _build_automaton():
+    """Flatten the keyword alternations into one automaton: keyword -> (priority, category)."""
+    A = ahocorasick.Automaton()
+    for prio, (cat, rx) in enumerate(COMPILED_RULES):
+        for word in rx.pattern.lower().split("|"):
+            if word not in A:  # earlier-declared category wins on duplicates
+                A.add_word(word, (prio, cat))
+    A.make_automaton()
+    return A
+
+def _build_hyperscan_db():
+    """Compile every category rule into one Hyperscan database; ids are rule priorities."""
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[rx.pattern.encode() for _, rx in COMPILED_RULES],
+        ids=list(range(len(COMPILED_RULES))),
+        elements=len(COMPILED_RULES),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_CASELESS] * len(COMPILED_RULES),
+    )
+    return db
+
+# pick one backend at import: Hyperscan, then Aho-Corasick, then plain regex
+HS_DB = _build_hyperscan_db() if hyperscan else None
+AUTOMATON = _build_automaton() if (HS_DB is None and ahocorasick and _keywords_are_literal()) else None
+
+def _hs_classify(desc: str, db=None) -> str:
+    hits = []
+    (db or HS_DB).scan(desc.encode(), match_event_handler=lambda id_, *_: hits.append(id_))
+    return COMPILED_RULES[min(hits)][0] if hits else "Other"
+
+def _ac_classify(desc: str, automaton=None) -> str:
+    # keywords are lowercase; fold ASCII only (str.lower() would also fold "K" -> "k")
+    folded = desc.lower() if desc.isascii() else desc.translate(_ASCII_LOWER)
+    hits = [v for _, v in (automaton or AUTOMATON).iter(folded)]
+    return min(hits)[1] if hits else "Other"
+
+def _regex_classify(desc: str) -> str:
+    for cat, rx in COMPILED_RULES:
+        if rx.search(desc):
+            return cat
+    return "Other"
+
+def classify_one(desc: str) -> str:
+    """Category for one description (any case), "Other" if no rule matches."""
+    if HS_DB is not None:
+        return _hs_classify(desc)
+    if AUTOMATON is not None:
+        return _ac_classify(desc)
+    return _regex_classify(desc)
+
+def check_backends(descriptions) -> tuple[list, list]:
+    """Compare every installed accelerator against the plain-regex rules.
+
+    Returns (mismatches, disabled): mismatches holds (description, regex result,
+    other results) where a backend disagrees; disabled names accelerators that are
+    installed but can't be used with the current rules. Both empty means equivalent.
+    """
+    backends, disabled = {}, []
+    if hyperscan:
+        db = HS_DB or _build_hyperscan_db()
+        backends["hyperscan"] = lambda d: _hs_classify(d, db)
+    if ahocorasick:
+        if _keywords_are_literal():
+            automaton = AUTOMATON or _build_automaton()
+            backends["ahocorasick"] = lambda d: _ac_classify(d, automaton)
+        else:
+            disabled.append("ahocorasick (rules aren't plain keywords)")
+
+    mismatches = []
+    for d in descriptions:
+        expected = _regex_classify(d)
+        got = {name: fn(d) for name, fn in backends.items()}
+        if any(v != expected for v in got.values()):
+            mismatches.append((d, expected, got))
+    return mismatches, disabled
+
 def auto_categorize(df: pd.DataFrame) -> pd.DataFrame:
+    """Fill blank categories from the rules (matching is case-insensitive)."""
     if df.empty:
         return df
 
     df = df.copy()
-    df["description"] = df["description"].astype(str).str.lower()
-
-    def classify(desc, existing):
-        if pd.notna(existing) and str(existing).strip():
-            return existing  # keep existing
-        for cat, patterns in CATEGORY_RULES.items():
-            for pat in patterns:
-                if re.search(pat, desc):
-                    return cat
-        return "Other"
-
-    df["category"] = [classify(d, c) for d, c in zip(df["description"], df["category"])]
+    desc = df["description"].astype(str)  # read_csv may infer numbers; no lowercasing needed
+
+    # only rows without a category get classified; existing ones are kept
+    if HS_DB is not None or AUTOMATON is not None:
+        # one multi-pattern scan per description; NaN/blank checks stay in plain Python
+        desc_arr = desc.to_numpy(dtype=object)
+        cat_arr = df["category"].to_numpy(dtype=object)
+        df["category"] = [
+            c if isinstance(c, str) and c.strip()
+            else (classify_one(d) if isinstance(d, str) else "Other")
+            for d, c in zip(desc_arr, cat_arr)
+        ]
+        return df
+
+    blank = df["category"].isna() | (df["category"].astype(str).str.strip() == "")
+    out = df["category"].where(~blank, "Other")
+    for cat, rx in COMPILED_RULES:
+        hit = blank & desc.str.contains(rx, regex=True, na=False)
+        out = out.mask(hit, cat)
+        blank &= ~hit
+
+    df["category"] = out
     return df
+
+
+if __name__ == "__main__":
+    # python categorize.py: check the accelerators agree with the regex rules
+    import random
+
+    words = [w for _, rx in COMPILED_RULES for w in rx.pattern.split("|")]
+    words += ["lunch", "team", "online", "refund", "x", "", "12"]
+    rng = random.Random(0)
+    samples = [" ".join(rng.choice(words) for _ in range(rng.randint(1, 4))) for _ in range(5000)]
+    samples = [d.upper() if i % 3 == 0 else d.title() if i % 3 == 1 else d for i, d in enumerate(samples)]
+    samples += words + ["".join(rng.sample(w, len(w))) for w in words]  # keywords and shuffled near-misses
+    samples += ["ſtarbucks", "starbuc\u212as", "P\u0130ZZA", "Ümbër CAFÉ", "ＵＢＥＲ"]  # non-ASCII case folds
+
+    bad, disabled = check_backends(samples)
+    for d, expected, got in bad[:20]:
+        print(f"❌ {d!r}: regex={expected} {got}")
+    for name in disabled:
+        print(f"❌ installed but disabled: {name}")
+    print(f"{len(samples) - len(bad)}/{len(samples)} descriptions agree across backends")
+    raise SystemExit(1 if bad or disabled else 0)
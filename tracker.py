@@ -1,8 +1,13 @@
 import argparse
+import csv
+import importlib.util
+import io
+import json
 from pathlib import Path
+import numpy as np
 import pandas as pd
 from dateutil.parser import parse
-from categorize import auto_categorize
+from categorize import auto_categorize, classify_one
 
 # --------------------------
 # Setup
@@ -10,8 +15,22 @@ from categorize import auto_categorize
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 STORE = DATA_DIR / "transactions.csv"
+SNAPSHOT = DATA_DIR / "transactions.parquet"  # typed read cache of STORE (needs pyarrow)
+SNAPSHOT_META = DATA_DIR / "transactions.parquet.json"  # which STORE bytes/stamp the snapshot matches
 
 COLUMNS = ["date", "category", "description", "money_spent", "money_left", "payment_method"]
+DATE_FMT = "%Y-%m-%d"  # on-disk and display format; in memory dates stay datetime64
+EOL = "\n"  # every STORE writer uses LF, whatever os.linesep is
+
+# rows per piece when streaming big CSVs
+CHUNK_ROWS = 50_000
+
+# pyarrow's multi-threaded CSV reader when available, else pandas' C parser
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+_CSV_ENGINE = "pyarrow" if _HAS_PYARROW else "c"
+
+# in-process cache of the parsed store; writers reset "df" to invalidate
+_STORE_CACHE = {"df": None, "stamp": None}
 
 # --------------------------
 # Helpers
@@ -19,7 +38,7 @@ COLUMNS = ["date", "category", "description", "money_spent", "money_left", "paym
 def ensure_store():
     """Make sure transactions.csv exists, otherwise create it empty."""
     if not STORE.exists():
-        pd.DataFrame(columns=COLUMNS).to_csv(STORE, index=False)
+        pd.DataFrame(columns=COLUMNS).to_csv(STORE, index=False, lineterminator=EOL)
 
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
     """Clean up imported CSV/Excel to match our schema (and map legacy 'amount')."""
@@ -37,7 +56,8 @@ def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
             df[col] = pd.NA
 
     # type fixes
-    df["date"] = pd.to_datetime(df["date"], errors="coerce").dt.date
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df["description"] = df["description"].astype(str).str.lower().str.strip()  # stored lowercased, as before
     df["money_spent"] = pd.to_numeric(df["money_spent"], errors="coerce").fillna(0.0)
     df["money_left"]  = pd.to_numeric(df["money_left"],  errors="coerce")
     df["payment_method"] = "UPI"  # your use-case
@@ -48,15 +68,121 @@ def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
 
 
 def load_store() -> pd.DataFrame:
-    """Load transactions.csv into a DataFrame."""
+    """Load transactions.csv into a DataFrame (cached until the file changes)."""
     ensure_store()
-    df = pd.read_csv(STORE)
-    if not df.empty:
-        df["date"] = pd.to_datetime(df["date"]).dt.date
+    stamp = _csv_stamp()
+    if _STORE_CACHE["df"] is not None and _STORE_CACHE["stamp"] == stamp:
+        return _STORE_CACHE["df"].copy()
+
+    df = _read_snapshot(stamp)
+    if df is None:
+        df = pd.read_csv(STORE, engine=_CSV_ENGINE)
+        if not df.empty:
+            df["date"] = pd.to_datetime(df["date"])  # keep datetime64 for fast filters
+        save_snapshot(df, stamp)
+    _STORE_CACHE["df"], _STORE_CACHE["stamp"] = df, stamp
+    return df.copy()
+
+def _csv_stamp() -> list:
+    """[size, mtime_ns] of transactions.csv; size catches appends within one mtime tick."""
+    st = STORE.stat()
+    return [st.st_size, st.st_mtime_ns]
+
+def _snapshot_meta() -> dict | None:
+    try:
+        return json.loads(SNAPSHOT_META.read_text())
+    except (OSError, ValueError):
+        return None
+
+def drop_snapshot():
+    """Remove the Parquet snapshot and its sidecar."""
+    SNAPSHOT_META.unlink(missing_ok=True)
+    SNAPSHOT.unlink(missing_ok=True)
+
+def save_snapshot(df: pd.DataFrame, stamp: list):
+    """Write the parsed store to transactions.parquet so later loads skip CSV parsing.
+
+    The sidecar records the CSV stamp the frame was read at and how many CSV
+    bytes it covers; the snapshot is only trusted on an exact stamp match.
+    """
+    if not _HAS_PYARROW or df.empty:
+        return
+    try:
+        SNAPSHOT_META.unlink(missing_ok=True)
+        df.to_parquet(SNAPSHOT, compression="zstd", index=False)
+        SNAPSHOT_META.write_text(json.dumps({"covers": stamp[0], "csv": stamp}))
+    except Exception:
+        drop_snapshot()  # never leave a stale/broken snapshot behind
+
+def _read_snapshot(stamp: list) -> pd.DataFrame | None:
+    """Snapshot rows plus any rows we appended since, or None if it can't be trusted."""
+    meta = _snapshot_meta() if _HAS_PYARROW else None
+    if meta is None:
+        return None
+    if meta["csv"] != stamp:
+        drop_snapshot()  # CSV changed outside our writers (edit, restore, ...)
+        return None
+    try:
+        df = pd.read_parquet(SNAPSHOT)
+        if stamp[0] > meta["covers"]:
+            # only parse the rows appended after the snapshot was taken
+            with STORE.open("rb") as f:
+                header = f.readline()
+                f.seek(meta["covers"])
+                tail = pd.read_csv(io.BytesIO(header + f.read()))
+            tail["date"] = pd.to_datetime(tail["date"])
+            df = pd.concat([df, tail], ignore_index=True)
+            if stamp[0] - meta["covers"] > meta["covers"]:
+                save_snapshot(df, stamp)  # tail outgrew the snapshot: amortized rewrite
+    except Exception:
+        drop_snapshot()
+        return None
     return df
 
+def note_append(before: list):
+    """Re-stamp the snapshot after one of our own appends instead of rewriting it.
+
+    before is the CSV stamp taken just before appending; if the snapshot didn't
+    match it, the snapshot is dropped.
+    """
+    meta = _snapshot_meta()
+    if meta is None:
+        return
+    if meta["csv"] != before:
+        drop_snapshot()
+        return
+    meta["csv"] = _csv_stamp()
+    SNAPSHOT_META.write_text(json.dumps(meta))
+
 def last_balance() -> float | None:
-    """Return the most recent money_left, or None if no rows yet."""
+    """Return the most recent money_left, or None if no rows yet.
+
+    Reads only the tail of transactions.csv so the cost doesn't grow with history.
+    """
+    ensure_store()
+    with STORE.open("rb") as f:
+        f.seek(0, 2)
+        pos = f.tell()
+        tail = b""
+        # step back until we hold the whole last line (a newline before it)
+        while pos > 0 and b"\n" not in tail.rstrip():
+            step = min(4096, pos)
+            pos -= step
+            f.seek(pos)
+            tail = f.read(step) + tail
+
+    lines = [ln for ln in tail.decode("utf-8", errors="replace").splitlines() if ln.strip()]
+    if not lines or (pos == 0 and len(lines) == 1):
+        return None  # header only
+    row = next(csv.reader([lines[-1]]))
+    # a short/long row means the tail began inside a quoted multi-line field
+    if len(row) == len(COLUMNS):
+        try:
+            return float(row[COLUMNS.index("money_left")])
+        except ValueError:
+            pass
+
+    # fall back to a full parse if the last line is odd (e.g. blank money_left)
     df = load_store()
     if df.empty:
         return None
@@ -66,25 +192,79 @@ def last_balance() -> float | None:
     except Exception:
         return None
 
+def filter_month(df: pd.DataFrame, month: str) -> pd.DataFrame:
+    """Rows whose date falls in month (YYYY-MM), via a datetime64 range compare."""
+    try:
+        start = pd.to_datetime(month, format="%Y-%m")
+    except ValueError:
+        raise SystemExit(f"❌ --month must be YYYY-MM (e.g., 2025-09), got {month!r}.") from None
+    end = start + pd.offsets.MonthBegin(1)
+    return df[(df["date"] >= start) & (df["date"] < end)]
+
+def _end_with_newline():
+    """Terminate a hand-edited/Excel-saved last line so appends start on a fresh line."""
+    with STORE.open("rb+") as f:
+        if f.seek(0, 2) == 0:
+            return
+        f.seek(-1, 2)
+        if f.read(1) != EOL.encode():
+            f.write(EOL.encode())
+
+def append_row(row: pd.DataFrame) -> pd.DataFrame:
+    """Auto-categorize the new row(s) only and append them to the store."""
+    row = auto_categorize(row)
+    before = _csv_stamp()
+    _end_with_newline()
+    row[COLUMNS].to_csv(STORE, mode="a", header=False, index=False, date_format=DATE_FMT, lineterminator=EOL)
+    note_append(before)
+    _STORE_CACHE["df"] = None
+    return row
+
+def append_record(record: dict):
+    """Append one already-typed row straight to the CSV (no DataFrame needed)."""
+    before = _csv_stamp()
+    _end_with_newline()
+    with STORE.open("a", newline="") as f:
+        csv.writer(f, lineterminator=EOL).writerow([record[c] for c in COLUMNS])
+    note_append(before)
+    _STORE_CACHE["df"] = None
+
 # --------------------------
 # Core functions
 # --------------------------
 def import_file(path: str):
-    """Import a CSV or Excel file and append to store (auto-categorized)."""
+    """Import a CSV or Excel file and append to store (auto-categorized).
+
+    CSVs are streamed in CHUNK_ROWS-sized pieces, so memory stays flat however
+    big the file is. Excel has no chunked reader and is loaded in one go.
+    """
     ensure_store()
     if path.lower().endswith((".xlsx", ".xls")):
-        df = pd.read_excel(path)
+        chunks = [pd.read_excel(path)]
     else:
-        df = pd.read_csv(path)
-    df = normalize_columns(df)
-    # NEW: auto-categorize incoming rows
-    df = auto_categorize(df)
+        chunks = pd.read_csv(path, chunksize=CHUNK_ROWS)  # pyarrow engine can't chunk
 
-    existing = load_store()
-    out = pd.concat([existing, df], ignore_index=True)
-    out = auto_categorize(out)  # ensure entire store stays consistent
-    out.to_csv(STORE, index=False)
-    print(f"✅ Imported {len(df)} rows into {STORE} (auto-categorized)")
+    total = 0
+    for chunk in chunks:
+        # auto-categorize incoming rows only, then append them
+        total += len(append_row(normalize_columns(chunk)))
+    print(f"✅ Imported {total} rows into {STORE} (auto-categorized)")
+
+
+def recategorize_store():
+    """Fill blank categories across the whole store, streaming it in chunks.
+
+    Writes to a temp file and renames it over transactions.csv, so a crash
+    mid-way never leaves a half-written store.
+    """
+    ensure_store()
+    tmp = STORE.with_suffix(".tmp")
+    for i, chunk in enumerate(pd.read_csv(STORE, chunksize=CHUNK_ROWS)):
+        auto_categorize(chunk).to_csv(tmp, mode="w" if i == 0 else "a", header=(i == 0), index=False,
+                                      lineterminator=EOL)
+    tmp.replace(STORE)
+    drop_snapshot()
+    _STORE_CACHE["df"] = None
 
 
 def add_expense(date, category, description, money_spent, money_left=None, start_balance=None):
@@ -112,21 +292,22 @@ def add_expense(date, category, description, money_spent, money_left=None, start
         money_left = (base - spent) if base is not None else None
     left = float(money_left)
 
-    # Build row (category may be "-" to request auto-categorization)
-    row = pd.DataFrame([{
-        "date": dt,
+    # Build row: an explicit category is kept as-is, "-" (or blank) asks for auto-categorization
+    desc = description.lower().strip()
+    if not category or category.strip() in ("", "-"):
+        category = classify_one(desc)
+    record = {
+        "date": dt.isoformat(),
         "category": category,
-        "description": description,
+        "description": desc,
         "money_spent": spent,
         "money_left": left,
         "payment_method": "UPI"
-    }])
+    }
 
-    # Append and then auto-categorize the combined store
-    out = pd.concat([load_store(), row], ignore_index=True)
-    out = auto_categorize(out)
-    out.to_csv(STORE, index=False)
-    print("✅ Saved (auto-categorized):", row.iloc[0].to_dict())
+    # Append only the new row (no full-store rewrite)
+    append_record(record)
+    print("✅ Saved (auto-categorized):", record)
 
 
 def show_tail(n=20, month=None):
@@ -135,8 +316,10 @@ def show_tail(n=20, month=None):
         print("No transactions yet.")
         return
     if month:
-        df = df[df["date"].astype(str).str.startswith(month)]
-    print(df.tail(n).to_string(index=False))
+        df = filter_month(df, month)
+    out = df.tail(n).copy()
+    out["date"] = out["date"].dt.strftime(DATE_FMT)  # format only at the print boundary
+    print(out.to_string(index=False))
 
 
 def add_income(date, description, amount, start_balance=None):
@@ -157,19 +340,17 @@ def add_income(date, description, amount, start_balance=None):
 
     new_balance = base + amt
 
-    row = pd.DataFrame([{
-        "date": dt,
+    record = {
+        "date": dt.isoformat(),
         "category": "Income",
-        "description": description,
+        "description": description.lower().strip(),
         "money_spent": -amt,   # negative = income
         "money_left": new_balance,
         "payment_method": "UPI"
-    }])
+    }
 
-    out = pd.concat([load_store(), row], ignore_index=True)
-    out = auto_categorize(out)
-    out.to_csv(STORE, index=False)
-    print("✅ Income added:", row.iloc[0].to_dict())
+    append_record(record)
+    print("✅ Income added:", record)
 
 # --------------------------
 # CLI
@@ -251,18 +432,19 @@ def main():
             print("No transactions yet.")
         else:
             if args.month:
-                df = df[df["date"].astype(str).str.startswith(args.month)]
+                df = filter_month(df, args.month)
             df = auto_categorize(df)
 
             # Split income vs expense
-            df["income"] = df["money_spent"].apply(lambda x: -x if x < 0 else 0)
-            df["expense"] = df["money_spent"].apply(lambda x: x if x > 0 else 0)
+            ms = df["money_spent"].to_numpy()
+            df["income"] = np.where(ms < 0, -ms, 0.0)
+            df["expense"] = np.where(ms > 0, ms, 0.0)
 
             # Group by category
             grouped = df.groupby("category")[["income", "expense"]].sum().sort_values("expense", ascending=False)
 
             print("\n📊 Category Summary")
-            print(grouped.to_string())
+            print(grouped.head(args.top).to_string())
 
             # Net totals
             total_income = df["income"].sum()
@@ -276,27 +458,8 @@ def main():
 
 
     elif args.cmd == "categorize":
-        df = load_store()
-        df2 = auto_categorize(df)
-        df2.to_csv(STORE, index=False)
+        recategorize_store()
         print("✅ Auto-categorized and saved to", STORE)
 
-    elif args.cmd == "summary":
-        df = load_store()
-        if df.empty:
-            print("No transactions yet.")
-        else:
-            df = auto_categorize(df)
-            totals = df.groupby("category")["money_spent"].sum().sort_values(ascending=False)
-            print(totals.head(args.top).to_string())
-
-    elif args.cmd == "income":
-        add_income(
-            date=args.date,
-            description=args.desc,
-            amount=args.amount,
-            start_balance=args.start
-        )
-
 if __name__ == "__main__":
     main()